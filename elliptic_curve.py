@@ -141,6 +141,17 @@ class Point:
     if self.y**2 != self.x**3 + self.a*self.x + self.b:
       raise ValueError('({}, {}) is not on the curve'.format(self.x, self.y))
 
+  # make a Point without checking that it's on the curve, for coordinates that are already known to be valid
+  # (for example, ones read back from a table of points that were checked when it was built)
+  @classmethod
+  def unchecked(cls, x, y, a, b):
+    point = cls.__new__(cls)
+    point.a = a
+    point.b = b
+    point.x = x
+    point.y = y
+    return point
+
   # '==' operator; Points are equal if and only if they are on the same curve and have the same coordinates
   def __eq__(self, other):
     return self.x == other.x and self.y == other.y \
@@ -195,6 +206,16 @@ class Point:
       # return an instance of the class to make subclassing easier
       return self.__class__(x, y, self.a, self.b)
     '''
+    One more exception...
+
+    CASE WHEN P1 == P2 && P1[1] = 0 (tangent and vertical line)
+
+    This has to be checked before the tangent case below, otherwise we'd divide by 2*y == 0.
+    '''
+    if self == other and self.y == (0 * self.x): # instead of figuring out what 0 is for each type, we just use '0 * self.x'
+      # return the point at infinity
+      return self.__class__(None, None, self.a, self.b)
+    '''
     CASE WHEN P1 == P2 (tangent line)
 
     CH2, Exercise 7:
@@ -204,14 +225,24 @@ class Point:
       x = s**2 - 2*self.x
       y = s*(self.x - x) - self.y
       return self.__class__(x, y, self.a, self.b)
-    '''
-    One more exception...
 
-    CASE WHEN P1 == P2 && P1[1] = 0 (tangent and vertical line)
-    '''
-    if self == other and self.y == (0 * self.x): # instead of figuring out what 0 is for each type, we just use '0 * self.x'
-      # return the point at infinity
-      return self.__class__(None, None, self.a, self.b)
+  # scalar multiplication, 'k * P', using binary expansion so that we only need about log2(k) additions
+  def __rmul__(self, coefficient):
+    # right shifting a negative number never reaches 0, so the loop below would never end
+    if coefficient < 0:
+      raise ValueError('Cannot multiply a point by a negative number {}'.format(coefficient))
+    coef = coefficient
+    current = self
+    # start at the point at infinity (additive identity)
+    result = self.__class__(None, None, self.a, self.b)
+    while coef:
+      # add the current power of two multiple of the point if the rightmost bit is set
+      if coef & 1:
+        result += current
+      # double the point for the next bit
+      current += current
+      coef >>= 1
+    return result
 
 '''
 CH 2, Example 1:
@@ -0,0 +1,62 @@
+'''
+Fixed-Base Exponentiation:
+
+Python's built-in 'pow' already does windowed exponentiation internally, so FieldElement.__pow__ keeps using it; a
+windowed version written in Python is no faster, and the exponents that keep coming up (p-2 for inverses, (p+1)/4 for
+square roots, (p-1)/2 for Euler's criterion) are applied to a different base every time, so there's nothing to reuse.
+Where the work really can be cut down is when the base stays the same and the exponent changes (for example the 'g' in
+g**k). A 'FixedBase' precomputes
+
+    table[i][d] == n**(d * 2**(width*i)),  for 0 <= d < 2**width,
+
+after which n**e is one table lookup and one multiplication per nonzero 'width' bit digit of e, with no squarings at
+all.
+'''
+
+
+class FixedBase:
+
+    def __init__(self, element, width=8):
+        if width < 1:
+            raise ValueError('width must be at least 1')
+        self.element = element
+        self.prime = element.prime
+        self.width = width
+        self._mask = mask = (1 << width) - 1
+        # exponents are reduced mod p-1, so they never need more bits than p-1 has
+        rows = ((self.prime - 1).bit_length() + width - 1) // width
+        self._table = []
+        base = element.num
+        for _ in range(rows):
+            row = [1]
+            for _ in range(mask):
+                row.append(row[-1] * base % self.prime)
+            self._table.append(row)
+            # the next row's base is this row's base to the 2**width
+            base = row[-1] * base % self.prime
+        self._table = tuple(tuple(row) for row in self._table)
+
+    def pow(self, exponent):
+        prime = self.prime
+        # same reduction as FieldElement.__pow__
+        e = exponent % (prime - 1)
+        result = 1
+        for row in self._table:
+            if not e:
+                break
+            digit = e & self._mask
+            if digit:
+                result = result * row[digit] % prime
+            e >>= self.width
+        return self.element.__class__(result, prime)
+
+
+'''
+TEST
+
+g = FixedBase(FieldElement(3, 223))
+print(g.pow(221) * FieldElement(3, 223))
+>>> FieldElement_223(1)
+print(g.pow(-1) == FieldElement(3, 223)**-1)
+>>> True
+'''
@@ -0,0 +1,197 @@
+from collections import OrderedDict
+
+from finite_field import FieldElement
+
+'''
+Lookup Table Arithmetic:
+
+The fields used in the exercises (p = 13, 19, 31, 57, 97, 223, ...) are
+small enough that every product, inverse and power can be computed up
+front. After that, '*', '/' and '**' are just list lookups:
+
+    mul[a*p + b] == (a * b) % p
+
+    inv[a] == a**(p-2) % p
+
+    pow[a*(p-1) + n] == a**n % p,  for 0 <= n < p-1.
+
+The tables are built the first time they're needed for a prime and
+then shared by every element of that field. Each element keeps a
+reference to its field's tables, so an operation doesn't have to look
+them up. The tables hold finished elements rather than numbers, so an
+operation just returns an element from a list instead of making a new
+one; don't change 'num' or 'prime' on a TableFieldElement, since the
+same object is handed out for every result with that value.
+
+A multiplication table has p**2 entries, so primes whose tables would
+be bigger than MAX_TABLE_ENTRIES fall back to the regular FieldElement
+arithmetic (as do tables that wouldn't fit in MAX_TOTAL_ENTRIES on
+their own). All tables together are kept under MAX_TOTAL_ENTRIES by
+dropping the tables of the primes that were built longest ago; they're
+rebuilt if those primes are used again.
+
+Building a table costs about as much as doing every operation in it
+once, so it only pays off when lots of operations are done in the same
+field. A single pass like CH1_Exercise_7, which takes one power of
+each element, is slower with a cold table than without one.
+'''
+
+# largest number of entries we're willing to store in a single table
+MAX_TABLE_ENTRIES = 2**20
+# largest number of entries we're willing to store across every prime
+MAX_TOTAL_ENTRIES = 2**22
+
+# prime -> _FieldTables; there's only ever one per prime, so every element of a field shares it
+_fields = {}
+# prime -> _FieldTables for the primes that have tables built, built longest ago first
+_built = OrderedDict()
+_total_entries = 0
+
+
+class _FieldTables:
+
+    def __init__(self, cls, prime):
+        # the class the elements in the tables are made with
+        self.cls = cls
+        self.prime = prime
+        self.elements = None
+        # None until built, False if the table would be too big
+        self.mul = None
+        self.inv = None
+        self.pow = None
+        self.entries = 0
+
+    def release(self):
+        self.elements = None
+        self.mul = None
+        self.inv = None
+        self.pow = None
+        self.entries = 0
+
+
+def _forget(prime):
+    global _total_entries
+    tables = _built.pop(prime)
+    _total_entries -= tables.entries
+    tables.release()
+
+
+def _build(tables, kind):
+    global _total_entries
+    prime = tables.prime
+    size = prime if kind == 'inv' else prime * prime
+    new_entries = size + (prime if tables.elements is None else 0)
+    # a table that couldn't fit even with every other prime's tables dropped isn't built at all
+    if size > MAX_TABLE_ENTRIES or tables.entries + new_entries > MAX_TOTAL_ENTRIES:
+        setattr(tables, kind, False)
+        return False
+    elements = tables.elements
+    if elements is None:
+        # one element per value, skipping the range check in __init__
+        elements = []
+        for num in range(prime):
+            element = object.__new__(tables.cls)
+            element.num = num
+            element.prime = prime
+            element._tables = tables
+            elements.append(element)
+        tables.elements = elements
+        tables.entries += prime
+        _total_entries += prime
+    if kind == 'mul':
+        table = [elements[(a * b) % prime] for a in range(prime) for b in range(prime)]
+    elif kind == 'inv':
+        table = [pow(a, prime - 2, prime) for a in range(prime)]
+    else:
+        # exponents are reduced mod (p-1), same as FieldElement.__pow__
+        table = [elements[pow(a, n, prime)] for a in range(prime) for n in range(prime - 1)]
+    _built[prime] = tables
+    _built.move_to_end(prime)
+    setattr(tables, kind, table)
+    tables.entries += len(table)
+    _total_entries += len(table)
+    # make room by dropping other primes, oldest first
+    while _total_entries > MAX_TOTAL_ENTRIES and len(_built) > 1:
+        _forget(next(iter(_built)))
+    return table
+
+
+# free the memory used by the tables, for one prime or all of them
+def clear_tables(prime=None):
+    for key in list(_built):
+        if prime is None or key == prime:
+            _forget(key)
+
+
+class TableFieldElement(FieldElement):
+
+    def __init__(self, num, prime):
+        # same check as FieldElement.__init__, written out since making elements is the hot path in the exercises
+        if num >= prime or num < 0:
+            error = 'Num {} not in field range 0 to {}'.format(
+                num, prime - 1)
+            raise ValueError(error)
+        self.num = num
+        self.prime = prime
+        tables = _fields.get(prime)
+        if tables is None:
+            tables = _fields.setdefault(prime, _FieldTables(self.__class__, prime))
+        self._tables = tables
+
+    def __mul__(self, other):
+        if self.prime != other.prime:
+            raise TypeError('Cannot multiply two numbers in different Fields')
+        mul = self._tables.mul
+        if mul is None:
+            mul = _build(self._tables, 'mul')
+        if mul is False:
+            return FieldElement.__mul__(self, other)
+        return mul[self.num * self.prime + other.num]
+
+    def __rmul__(self, coefficient):
+        # Python tries this before FieldElement.__mul__ for 'FieldElement * TableFieldElement'
+        if isinstance(coefficient, FieldElement):
+            return self.__mul__(coefficient)
+        mul = self._tables.mul
+        if mul is None:
+            mul = _build(self._tables, 'mul')
+        if mul is False:
+            return FieldElement.__rmul__(self, coefficient)
+        return mul[(coefficient % self.prime) * self.prime + self.num]
+
+    def __pow__(self, exponent):
+        table = self._tables.pow
+        if table is None:
+            table = _build(self._tables, 'pow')
+        if table is False:
+            return FieldElement.__pow__(self, exponent)
+        n = exponent % (self.prime - 1)
+        return table[self.num * (self.prime - 1) + n]
+
+    def __div__(self, other):
+        if self.prime != other.prime:
+            raise TypeError('Cannot divide two numbers in different Fields')
+        mul = self._tables.mul
+        if mul is None:
+            mul = _build(self._tables, 'mul')
+        inv = self._tables.inv
+        if inv is None:
+            inv = _build(self._tables, 'inv')
+        if mul is False or inv is False:
+            return FieldElement.__div__(self, other)
+        return mul[self.num * self.prime + inv[other.num]]
+
+    __truediv__ = __div__
+
+
+'''
+TEST
+
+a = TableFieldElement(3, 31)
+b = TableFieldElement(24, 31)
+
+print(a / b)
+>>> FieldElement_31(4)
+print(TableFieldElement(17, 31)**87)
+>>> FieldElement_31(29)
+'''
@@ -0,0 +1,128 @@
+from finite_field import FieldElement, batch_inverse
+from elliptic_curve import Point
+
+'''
+Scanning Consecutive Multiples:
+
+  To walk through k*G, (k+1)*G, ..., (k+n-1)*G we don't need a scalar multiplication for every key. We only compute
+  Q = k*G once, and every following point is the previous one plus G.
+
+  Adding points one at a time still costs one inversion per point (the division in the slope). To share those, we
+  precompute G, 2*G, ..., B*G once and then produce a whole block from a single base point Q:
+
+    Q, Q + G, Q + 2*G, ..., Q + (B-1)*G, and the next base point Q + B*G.
+
+  None of these additions depend on each other, so all B slopes
+
+    s_j = (y_j - y_Q) / (x_j - x_Q)
+
+  can be computed with one call to 'batch_inverse'. Memory stays at about 2*B points no matter how many keys we scan.
+
+  To split a scan across processes, hand each one its own (start, count) from 'split_range'; every process computes
+  its own starting point, so they don't need to talk to each other.
+'''
+
+
+# split [start, start + count) into 'parts' consecutive (start, count) ranges of nearly equal size
+def split_range(start, count, parts):
+  if parts < 1:
+    raise ValueError('Cannot split a range into {} parts'.format(parts))
+  size, extra = divmod(count, parts)
+  ranges = []
+  for i in range(parts):
+    part_count = size + (1 if i < extra else 0)
+    ranges.append((start, part_count))
+    start += part_count
+  return ranges
+
+
+def scan_multiples(generator, start, count, block_size=256):
+  '''
+  Yields start*G, (start+1)*G, ..., (start+count-1)*G one point at a time, where G is 'generator'.
+  '''
+  if start < 0 or count < 0:
+    raise ValueError('start and count must not be negative')
+  if block_size < 1:
+    raise ValueError('block_size must be at least 1')
+  if generator.x is None:
+    raise ValueError('Cannot scan multiples of the point at infinity')
+  if count == 0:
+    return
+  prime = generator.x.prime
+  a, b = generator.a, generator.b
+  # blocks are never longer than the scan, so short scans don't pay for a full table
+  block_size = min(block_size, count)
+  # offsets[j] == (j+1)*G
+  offsets = [generator]
+  for _ in range(block_size - 1):
+    offsets.append(offsets[-1] + generator)
+  base = start * generator
+  remaining = count
+  while True:
+    # this block yields Q, Q + G, ..., Q + (take-1)*G and, if the scan goes on, also computes Q + take*G
+    take = min(block_size, remaining)
+    yield base
+    next_base = remaining > take
+    sums = _add_to_all(base, offsets[:take if next_base else take - 1], prime, a, b)
+    for point in sums[:take - 1]:
+      yield point
+    remaining -= take
+    if not remaining:
+      return
+    base = sums[take - 1]
+
+
+# [Q + P for P in points], with the inversions for all the slopes shared
+def _add_to_all(base, points, prime, a, b):
+  if base.x is None:
+    return list(points)
+  denominators = []
+  for point in points:
+    # same x means doubling or a vertical line, which Point.__add__ handles; leave a 0 so it's skipped here
+    if point.x is None or point.x.num == base.x.num:
+      denominators.append(0)
+    else:
+      denominators.append(point.x.num - base.x.num)
+  inverses = batch_inverse(denominators, prime)
+  x1, y1 = base.x.num, base.y.num
+  results = []
+  for point, d, inv in zip(points, denominators, inverses):
+    if d == 0:
+      results.append(base + point)
+      continue
+    x2, y2 = point.x.num, point.y.num
+    s = (y2 - y1) * inv % prime
+    x3 = (s * s - x1 - x2) % prime
+    y3 = (s * (x1 - x3) - y1) % prime
+    results.append(Point(FieldElement(x3, prime), FieldElement(y3, prime), a, b))
+  return results
+
+
+'''
+Example:
+
+prime = 223
+a = FieldElement(0, prime)
+b = FieldElement(7, prime)
+G = Point(FieldElement(47, prime), FieldElement(71, prime), a, b)
+
+for point in scan_multiples(G, 5, 4, block_size=2):
+  print(point)
+
+>>> Point(126,96)_0_7 FieldElement(223)
+>>> Point(139,137)_0_7 FieldElement(223)
+>>> Point(92,47)_0_7 FieldElement(223)
+>>> Point(116,55)_0_7 FieldElement(223)
+
+Splitting across processes:
+
+from multiprocessing import Pool
+
+def count_points(job):
+  return sum(1 for _ in scan_multiples(G, job[0], job[1]))
+
+with Pool(4) as pool:
+  print(sum(pool.map(count_points, split_range(1, 10000, 4))))
+
+>>> 10000
+'''
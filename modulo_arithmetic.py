@@ -200,12 +200,13 @@ CH1_Exercise_5(19, [1,3,7,13,18])
 
     For p = 7,11,17,31, what is the set {1^(p-1), 2^(p-1), 3^(p-1), 4^(p-1), ..., p-1^(p-1)} in F_p?
 '''
-def CH1_Exercise_7(prime_list):
+def CH1_Exercise_7(prime_list, field=FieldElement):
+  # pass field=TableFieldElement (see field_tables.py) to do the exponentiation with table lookups
 
   for p in prime_list:
     set = []
     for n in range(1,p):
-      set.append(FieldElement(n,p) ** (p-1))
+      set.append(field(n,p) ** (p-1))
     print(set)
 
 CH1_Exercise_7([7,11,17,31])
@@ -0,0 +1,262 @@
+import hashlib
+import random
+
+from finite_field import FieldElement, batch_inverse
+from elliptic_curve import Point
+
+'''
+Sampling Points:
+
+  Picking coordinates by hand and checking whether y**2 == x**3 + a*x + b only finds points by luck. To get a point
+  from arbitrary bytes or integers we need to find an x for which x**3 + a*x + b is a square and then take its square
+  root. Two ways of doing that:
+
+    1) Try-and-increment:
+
+        Hash the input to a field element x, and while x**3 + a*x + b is not a square, try x + 1. About half of all
+        field elements are squares, so this takes two tries on average, but the number of tries depends on the input.
+
+
+    2) Shallue-van de Woestijne (SvdW):
+
+        A fixed sequence of field operations that turns any field element u into a point. It produces three candidate
+        x values, and it can be shown that at least one of them always gives a square. The constants only depend on
+        the curve, so they're computed once. The popular 'simplified SWU' map needs a != 0, which rules out curves like
+        secp256k1 (a=0, b=7); SvdW works for those. The constants and steps follow RFC 9380, section 6.6.1.
+
+  Euler's criterion tells us whether n is a square:
+
+    n**((p-1)/2) == 1 if n is a nonzero square, and p-1 otherwise.
+
+  When p % 4 == 3 the square root is simply n**((p+1)/4), otherwise we fall back to Tonelli-Shanks. These exponents
+  only depend on p, so we cache them per prime. For small primes we go a step further and tabulate every square root.
+
+  Note that no cofactor clearing is done, so on curves whose group order isn't prime the resulting points may not be in
+  the subgroup generated by a particular generator point.
+'''
+
+# primes up to this size get a complete table of square roots
+SQRT_TABLE_LIMIT = 2**16
+
+# prime -> (legendre exponent, square root data, square root table or None)
+_prime_cache = {}
+# (prime, a, b) -> SvdW constants
+_svdw_cache = {}
+
+
+def _prime_data(prime):
+  data = _prime_cache.get(prime)
+  if data is None:
+    legendre_exp = (prime - 1) // 2
+    if prime % 4 == 3:
+      sqrt_data = ((prime + 1) // 4,)
+    else:
+      # Tonelli-Shanks: p - 1 = q * 2**s with q odd, and z is any non-square
+      q, s = prime - 1, 0
+      while q % 2 == 0:
+        q //= 2
+        s += 1
+      z = 2
+      while pow(z, legendre_exp, prime) != prime - 1:
+        z += 1
+      sqrt_data = (q, s, z)
+    table = None
+    if prime <= SQRT_TABLE_LIMIT:
+      table = {}
+      for root in range(prime // 2 + 1):
+        table[root * root % prime] = root
+    data = (legendre_exp, sqrt_data, table)
+    _prime_cache[prime] = data
+  return data
+
+
+def is_square(n, prime):
+  legendre_exp, _, table = _prime_data(prime)
+  if table is not None:
+    return n % prime in table
+  n %= prime
+  return n == 0 or pow(n, legendre_exp, prime) == 1
+
+
+# one of the two square roots of n mod prime, or None if n isn't a square
+def sqrt_mod(n, prime):
+  _, sqrt_data, table = _prime_data(prime)
+  n %= prime
+  if table is not None:
+    return table.get(n)
+  if not is_square(n, prime):
+    return None
+  if len(sqrt_data) == 1:
+    return pow(n, sqrt_data[0], prime)
+  q, s, z = sqrt_data
+  m = s
+  c = pow(z, q, prime)
+  t = pow(n, q, prime)
+  r = pow(n, (q + 1) // 2, prime)
+  while t != 1 and t != 0:
+    # find the least i with t**(2**i) == 1
+    i, t2 = 0, t
+    while t2 != 1:
+      t2 = t2 * t2 % prime
+      i += 1
+    b = pow(c, 1 << (m - i - 1), prime)
+    m = i
+    c = b * b % prime
+    t = t * c % prime
+    r = r * b % prime
+  return 0 if t == 0 else r
+
+
+# integers are hashed as their big-endian two's complement bytes, so negative numbers work too; a type tag in front
+# keeps the integer 1 and the bytes b'\x01' from hashing to the same point
+def _to_bytes(data):
+  if isinstance(data, int):
+    return b'int:' + data.to_bytes(data.bit_length() // 8 + 1, 'big', signed=True)
+  if isinstance(data, bytes):
+    return b'bytes:' + data
+  raise TypeError('Can only hash bytes or integers, not {}'.format(type(data).__name__))
+
+
+def hash_to_field(data, prime):
+  data = _to_bytes(data)
+  # pull in extra bytes so that reducing mod prime is close to uniform
+  size = (prime.bit_length() + 7) // 8 + 16
+  digest = b''
+  counter = 0
+  while len(digest) < size:
+    digest += hashlib.sha256(counter.to_bytes(4, 'big') + data).digest()
+    counter += 1
+  return int.from_bytes(digest[:size], 'big') % prime
+
+
+def _make_point(x, y, a, b):
+  prime = a.prime
+  return Point(FieldElement(x, prime), FieldElement(y, prime), a, b)
+
+
+def hash_to_curve_try_and_increment(data, a, b):
+  prime = a.prime
+  x = hash_to_field(data, prime)
+  # use a separate hash bit to pick between y and -y
+  parity = hash_to_field(b'sign' + _to_bytes(data), 2)
+  while True:
+    gx = (x**3 + a.num * x + b.num) % prime
+    y = sqrt_mod(gx, prime)
+    if y is not None:
+      if y % 2 != parity:
+        y = (prime - y) % prime
+      return _make_point(x, y, a, b)
+    x = (x + 1) % prime
+
+
+def _svdw_constants(prime, a, b):
+  key = (prime, a, b)
+  constants = _svdw_cache.get(key)
+  if constants is None:
+    def g(x):
+      return (x**3 + a * x + b) % prime
+    # RFC 9380, Appendix H.1: find Z by trying 1, -1, 2, -2, ...
+    z = None
+    for ctr in range(1, prime):
+      for candidate in [ctr % prime, -ctr % prime]:
+        gz = g(candidate)
+        h = 3 * candidate * candidate + 4 * a
+        if gz == 0 or h % prime == 0:
+          continue
+        t = -h * pow(4 * gz, prime - 2, prime) % prime
+        if t == 0 or not is_square(t, prime):
+          continue
+        if is_square(gz, prime) or is_square(g(-candidate * pow(2, prime - 2, prime)), prime):
+          z = candidate
+          break
+      if z is not None:
+        break
+    if z is None:
+      raise ValueError('No SvdW constant Z exists for y^2 = x^3 + {}x + {} over F_{}'.format(a, b, prime))
+    h = (3 * z * z + 4 * a) % prime
+    c1 = g(z)
+    c2 = -z * pow(2, prime - 2, prime) % prime
+    c3 = sqrt_mod(-c1 * h, prime)
+    # RFC 9380 fixes the sign of c3 so that sgn0(c3) == 0
+    if c3 % 2 == 1:
+      c3 = prime - c3
+    c4 = -4 * c1 * pow(h, prime - 2, prime) % prime
+    constants = (z, c1, c2, c3, c4)
+    _svdw_cache[key] = constants
+  return constants
+
+
+# the SvdW map for a single field element, given inv = 1 / ((1 - u**2*c1) * (1 + u**2*c1)) (or 0)
+def _svdw_map(u, inv, prime, a, b, constants):
+  z, c1, c2, c3, c4 = constants
+  tv1 = u * u * c1 % prime
+  tv2 = (1 + tv1) % prime
+  tv1 = (1 - tv1) % prime
+  tv4 = u * tv1 * inv * c3 % prime
+  x1 = (c2 - tv4) % prime
+  x2 = (c2 + tv4) % prime
+  x3 = tv2 * tv2 * inv % prime
+  x3 = (x3 * x3 * c4 + z) % prime
+  # evaluate every candidate so the amount of work doesn't depend on u
+  e1 = is_square((x1**3 + a * x1 + b) % prime, prime)
+  e2 = is_square((x2**3 + a * x2 + b) % prime, prime)
+  x = x1 if e1 else (x2 if e2 else x3)
+  y = sqrt_mod((x**3 + a * x + b) % prime, prime)
+  if u % 2 != y % 2:
+    y = (prime - y) % prime
+  return x, y
+
+
+def _svdw_denominator(u, prime, c1):
+  tv1 = u * u * c1 % prime
+  return (1 - tv1) * (1 + tv1) % prime
+
+
+def map_to_curve(u, a, b):
+  prime = a.prime
+  constants = _svdw_constants(prime, a.num, b.num)
+  d = _svdw_denominator(u, prime, constants[1])
+  # inv0: the inverse of 0 is taken to be 0
+  inv = pow(d, prime - 2, prime) if d else 0
+  x, y = _svdw_map(u, inv, prime, a.num, b.num, constants)
+  return _make_point(x, y, a, b)
+
+
+def hash_to_curve(data, a, b):
+  return map_to_curve(hash_to_field(data, a.prime), a, b)
+
+
+def map_to_curve_bulk(us, a, b):
+  # the only inversion in the SvdW map is shared across the whole batch, see batch_inverse in finite_field.py
+  prime = a.prime
+  constants = _svdw_constants(prime, a.num, b.num)
+  inverses = batch_inverse([_svdw_denominator(u, prime, constants[1]) for u in us], prime)
+  points = []
+  for u, inv in zip(us, inverses):
+    x, y = _svdw_map(u, inv, prime, a.num, b.num, constants)
+    points.append(_make_point(x, y, a, b))
+  return points
+
+
+def random_points(count, a, b, rng=None):
+  if rng is None:
+    rng = random.SystemRandom()
+  us = [rng.randrange(a.prime) for _ in range(count)]
+  return map_to_curve_bulk(us, a, b)
+
+
+'''
+Example:
+
+prime = 223
+a = FieldElement(0, prime)
+b = FieldElement(7, prime)
+
+print(hash_to_curve(b'Programming Bitcoin', a, b))
+print(hash_to_curve_try_and_increment(b'Programming Bitcoin', a, b))
+print(len(random_points(5000, a, b)))
+
+>>> Point(98,94)_0_7 FieldElement(223)
+>>> Point(27,206)_0_7 FieldElement(223)
+>>> 5000
+'''
@@ -0,0 +1,191 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+from finite_field import FieldElement
+from elliptic_curve import Point
+
+'''
+Precomputed Point Tables:
+
+  Multiplying a generator point G by a scalar k using binary expansion needs about log2(k) doublings and additions.
+  The doublings don't depend on k at all: we always need G, 2*G, 4*G, ..., 2**(n-1)*G. So we can compute these once,
+  save them to a file and, at startup, read them back instead of recomputing them in every process.
+
+  The file is laid out as fixed-width big-endian integers so any entry can be found with a bit of arithmetic, which
+  lets us 'mmap' the file and only decode the entries we actually touch. Since the mapping is read-only, every process
+  that loads the same file shares the same pages from the operating system's page cache.
+
+  Layout:
+
+    header   magic (4 bytes) | version (2) | width (2) | count (4)
+             prime | a | b | gx | gy           (each 'width' bytes)
+             sha256 checksum                   (32 bytes, of the fields above and the entries)
+
+    entries  flag (1 byte) | x | y             (x and y 'width' bytes each, 'count' entries)
+
+  'width' is the number of bytes needed to hold the prime. The flag byte is 0 for the point at infinity, in which case
+  x and y are written as zeros, and 1 otherwise.
+
+  The file is written under a temporary name and then renamed into place, so a process that opens it while it's being
+  generated sees either the old file or the complete new one, never half of it.
+'''
+
+MAGIC = b'PBPT'
+VERSION = 2
+# magic, version, width, count
+HEADER_FORMAT = '>4sHHI'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+CHECKSUM_SIZE = 32
+
+
+def _int_to_bytes(n, width):
+  return n.to_bytes(width, 'big')
+
+
+def _int_from_bytes(data):
+  return int.from_bytes(data, 'big')
+
+
+# the doubling table for G: [G, 2*G, 4*G, ..., 2**(count-1)*G]
+def build_doubling_table(generator, count):
+  table = []
+  current = generator
+  for _ in range(count):
+    table.append(current)
+    current += current
+  return table
+
+
+def write_table(path, generator, points):
+  prime = generator.x.prime
+  width = (prime.bit_length() + 7) // 8
+  entries = []
+  for point in points:
+    if point.x is None:
+      entries.append(b'\x00' + _int_to_bytes(0, 2 * width))
+    else:
+      entries.append(b'\x01' + _int_to_bytes(point.x.num, width) + _int_to_bytes(point.y.num, width))
+  body = b''.join(entries)
+  header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, width, len(entries))
+  for n in [prime, generator.a.num, generator.b.num, generator.x.num, generator.y.num]:
+    header += _int_to_bytes(n, width)
+  header += hashlib.sha256(header + body).digest()
+  # write next to the destination so the rename stays on the same filesystem
+  fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+  try:
+    with os.fdopen(fd, 'wb') as f:
+      f.write(header)
+      f.write(body)
+    os.replace(temp_path, path)
+  except BaseException:
+    os.remove(temp_path)
+    raise
+
+
+class PointTable:
+
+  def __init__(self, path, verify=True):
+    self._file = open(path, 'rb')
+    try:
+      self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+      self._file.close()
+      raise ValueError('{} is empty'.format(path))
+    try:
+      self._read_header(path, verify)
+    except ValueError:
+      self.close()
+      raise
+
+  def _read_header(self, path, verify):
+    if len(self._map) < HEADER_SIZE:
+      raise ValueError('{} is too short to be a point table'.format(path))
+    magic, version, width, count = struct.unpack(HEADER_FORMAT, self._map[:HEADER_SIZE])
+    if magic != MAGIC:
+      raise ValueError('{} is not a point table'.format(path))
+    if version != VERSION:
+      raise ValueError('Unsupported point table version {}'.format(version))
+    self.width = width
+    self.count = count
+    self._entry_size = 1 + 2 * width
+    offset = HEADER_SIZE
+    params = []
+    for _ in range(5):
+      params.append(_int_from_bytes(self._map[offset:offset + width]))
+      offset += width
+    self.prime = params[0]
+    checksum = self._map[offset:offset + CHECKSUM_SIZE]
+    self._body_offset = offset + CHECKSUM_SIZE
+    if len(self._map) != self._body_offset + count * self._entry_size:
+      raise ValueError('{} is truncated or has trailing data'.format(path))
+    # hashing reads every page once, workers that trust the file can skip this with verify=False
+    if verify and hashlib.sha256(self._map[:offset] + self._map[self._body_offset:]).digest() != checksum:
+      raise ValueError('Checksum mismatch in {}'.format(path))
+    self.a = FieldElement(params[1], self.prime)
+    self.b = FieldElement(params[2], self.prime)
+    self.generator = Point(FieldElement(params[3], self.prime), FieldElement(params[4], self.prime), self.a, self.b)
+
+  def __len__(self):
+    return self.count
+
+  # decode a single entry straight from the mapped file
+  def __getitem__(self, index):
+    if index < 0:
+      index += self.count
+    if index < 0 or index >= self.count:
+      raise IndexError('Point table index out of range')
+    start = self._body_offset + index * self._entry_size
+    if self._map[start:start + 1] == b'\x00':
+      return Point(None, None, self.a, self.b)
+    x = _int_from_bytes(self._map[start + 1:start + 1 + self.width])
+    y = _int_from_bytes(self._map[start + 1 + self.width:start + self._entry_size])
+    # the coordinates were checked when the table was built, so skip the curve check
+    return Point.unchecked(FieldElement(x, self.prime), FieldElement(y, self.prime), self.a, self.b)
+
+  # k * G using the doubling table, so only the additions are left to do
+  def multiply(self, coefficient):
+    if coefficient < 0:
+      raise ValueError('Cannot multiply a point by a negative number {}'.format(coefficient))
+    if coefficient.bit_length() > self.count:
+      raise ValueError('Coefficient {} needs more than {} table entries'.format(coefficient, self.count))
+    result = Point(None, None, self.a, self.b)
+    index = 0
+    while coefficient:
+      if coefficient & 1:
+        result += self[index]
+      coefficient >>= 1
+      index += 1
+    return result
+
+  def close(self):
+    if not self._map.closed:
+      self._map.close()
+    self._file.close()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.close()
+
+
+'''
+Example:
+
+prime = 223
+a = FieldElement(0, prime)
+b = FieldElement(7, prime)
+G = Point(FieldElement(47, prime), FieldElement(71, prime), a, b)
+
+write_table('g223.table', G, build_doubling_table(G, 8))
+
+with PointTable('g223.table') as table:
+  print(table.multiply(7))
+  print(7 * G)
+
+>>> Point(92,47)_0_7 FieldElement(223)
+>>> Point(92,47)_0_7 FieldElement(223)
+'''